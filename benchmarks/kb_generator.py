@@ -0,0 +1,103 @@
+"""
+Генератор синтетических баз знаний в формате base.json.
+
+Пример:
+    python -m benchmarks.kb_generator --rules 10000 --facts 2000 --out /tmp/kb.json
+"""
+import argparse
+import json
+import random
+from typing import Dict, List, Optional
+
+ACTION_KEY = "действие"
+
+
+def generate_kb(rules: int = 1000, facts: int = 200, fan_in: int = 3, depth: int = 3,
+                conflict_rate: float = 0.1, seed: int = 0) -> Dict[str, Dict]:
+    """
+    Сгенерировать базу знаний.
+
+    Факты делятся на уровни: уровень 0 — вопросы пользователю, уровни 1..depth-1 —
+    выводимые факты. Правило уровня L берёт условия из фактов уровня L и вопросов и
+    выводит факт уровня L+1, правила последнего уровня выводят действие. Так
+    получаются цепочки вывода длиной depth.
+
+    :param rules: Количество правил.
+    :param facts: Количество фактов (кроме ключа действия).
+    :param fan_in: Максимальное количество условий в правиле.
+    :param depth: Длина цепочек вывода.
+    :param conflict_rate: Доля правил, повторяющих условия предыдущего правила с одним
+        инвертированным значением, то есть конфликтующих с ним.
+    :param seed: Зерно генератора случайных чисел.
+    """
+    if depth < 1 or fan_in < 1:
+        raise ValueError("depth и fan_in должны быть положительными")
+    if facts < depth + fan_in:
+        raise ValueError("Слишком мало фактов для заданных depth и fan_in")
+
+    rnd = random.Random(seed)
+
+    # Выводимым фактам отдаётся не больше половины фактов
+    derived_per_level = max(1, facts // (2 * depth)) if depth > 1 else 0
+    base_count = facts - derived_per_level * (depth - 1)
+    levels: List[List[str]] = [[f"факт {i}" for i in range(base_count)]]
+    for level in range(1, depth):
+        levels.append([f"вывод {level}.{i}" for i in range(derived_per_level)])
+
+    kb_facts: Dict[str, Optional[str]] = {ACTION_KEY: None}
+    for i, name in enumerate(levels[0]):
+        kb_facts[name] = f"Вопрос {i}?"
+    for level in levels[1:]:
+        for name in level:
+            kb_facts[name] = f"Верно ли, что {name}?"
+
+    kb_rules: Dict[str, Dict] = {}
+    previous = None
+    for rule_id in range(1, rules + 1):
+        if previous is not None and rnd.random() < conflict_rate:
+            conditions = dict(previous["if"])
+            flipped = rnd.choice(list(conditions))
+            conditions[flipped] = 1 - conditions[flipped]
+            then = dict(previous["then"])
+        else:
+            level = (rule_id - 1) % depth
+            count = rnd.randint(1, fan_in)
+            # Хотя бы одно условие берётся с уровня правила, остальные — из вопросов
+            names = [rnd.choice(levels[level])]
+            names += [name for name in rnd.sample(levels[0], count) if name not in names][:count - 1]
+            conditions = {name: rnd.randint(0, 1) for name in names}
+            if level + 1 < depth:
+                then = {rnd.choice(levels[level + 1]): rnd.randint(0, 1)}
+            else:
+                then = {ACTION_KEY: f"Действие {rule_id}"}
+        rule = {"if": conditions, "then": then}
+        kb_rules[str(rule_id)] = rule
+        previous = rule
+
+    return {"facts": kb_facts, "rules": kb_rules}
+
+
+def write_kb(file_name: str, **params) -> Dict[str, Dict]:
+    """Сгенерировать базу знаний и записать её в файл."""
+    data = generate_kb(**params)
+    with open(file_name, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=4)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генератор синтетической базы знаний")
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--facts", type=int, default=200)
+    parser.add_argument("--fan-in", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--conflict-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Путь к создаваемому JSON файлу")
+    args = parser.parse_args()
+    write_kb(args.out, rules=args.rules, facts=args.facts, fan_in=args.fan_in, depth=args.depth,
+             conflict_rate=args.conflict_rate, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Нагрузочное тестирование веб-интерфейса несколькими одновременными клиентами.
+
+Скрипт запускает main.py без нативного окна, открывает страницы по HTTP и подключается
+к ним через Socket.IO так же, как браузер. Консультанты проходят /cons, отвечая на вопросы
+по сценарию, редакторы переходят между /rules и /rule/{id}: в одностраничном режиме внутри
+одного соединения, как при переходах по истории браузера, а с --pages каждая страница
+загружается заново. Запуск из корня репозитория:
+
+    python -m benchmarks.load_test --consultants 20 --editors 5 --output load.json
+    python -m benchmarks.load_test --consultants 20 --editors 5 --pages --output load-pages.json
+
+В отчёт попадают p50/p99 задержки шага и перехода, прирост памяти сервера на сессию и
+задержка цикла событий сервера, оцениваемая по времени ответа на запрос статического файла.
+"""
+import argparse
+import ast
+import asyncio
+import importlib.metadata
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+import socketio
+
+from engine.journal import DEFAULT_FILE_NAME, get_journal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Лёгкий запрос для оценки задержки цикла событий: статический файл, без построения страницы
+PROBE_PATH = f"/_nicegui/{importlib.metadata.version('nicegui')}/static/favicon.ico"
+ANSWERS = ("Да", "Нет", "Не знаю")
+
+ELEMENTS_RE = re.compile(r"parseElements\(String\.raw`(.*?)`\)", re.S)
+QUERY_RE = re.compile(r"query: (\{.*?\}),\n")
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Статистика по замерам в секундах."""
+    if not samples:
+        return {"n": 0}
+    return {
+        "n": len(samples),
+        "p50": percentile(samples, 0.5),
+        "p99": percentile(samples, 0.99),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+    }
+
+
+def server_rss(pid: int) -> int:
+    """Резидентная память процесса в байтах (Linux)."""
+    with open(f"/proc/{pid}/status", encoding="utf-8") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+class PageSession:
+    """Соединение с одной страницей: HTTP-загрузка, Socket.IO и локальная копия дерева элементов."""
+
+    def __init__(self, base_url: str, http: httpx.AsyncClient):
+        self.base_url = base_url
+        self.http = http
+        self.sio: Optional[socketio.AsyncClient] = None
+        self.elements: Dict[str, Dict] = {}
+        self.client_id = None
+        self._updated = asyncio.Event()
+
+    async def open(self, path: str) -> float:
+        """Открыть страницу и дождаться первого обновления. Возвращает время загрузки."""
+        start = time.perf_counter()
+        response = await self.http.get(self.base_url + path)
+        response.raise_for_status()
+        self.elements = json.loads(ELEMENTS_RE.search(response.text).group(1))
+        query = ast.literal_eval(QUERY_RE.search(response.text).group(1))
+        self.client_id = query["client_id"]
+        query.update(tab_id=str(uuid.uuid4()), document_id=str(uuid.uuid4()),
+                     implicit_handshake="true", next_message_id=query.get("next_message_id", 0))
+
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on("update", self._on_update)
+        await self.sio.connect(f"{self.base_url}?{httpx.QueryParams(query)}",
+                               socketio_path="/_nicegui_ws/socket.io", transports=["websocket"])
+        elapsed = time.perf_counter() - start
+        # Отложенные refresh() страницы приходят первым обновлением после подключения
+        await self.wait_update(timeout=1.0)
+        return elapsed
+
+    async def _on_update(self, data: Dict) -> None:
+        data.pop("_id", None)
+        for element_id, element in data.items():
+            if element is None:
+                self.elements.pop(element_id, None)
+            else:
+                self.elements[element_id] = element
+        self._updated.set()
+
+    async def wait_update(self, timeout: float) -> bool:
+        if timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._updated.clear()
+
+    def find_button(self, label: str) -> Optional[tuple]:
+        for element_id, element in self.elements.items():
+            if element.get("tag") == "q-btn" and element.get("props", {}).get("label") == label:
+                for event in element.get("events", []):
+                    if event["type"] == "click":
+                        return element_id, event["listener_id"]
+        return None
+
+    async def click(self, label: str, timeout: float) -> Optional[float]:
+        """Нажать кнопку и дождаться обновления страницы. Возвращает задержку шага."""
+        button = self.find_button(label)
+        if button is None:
+            return None
+        self._updated.clear()
+        start = time.perf_counter()
+        await self.sio.emit("event", {"id": int(button[0]), "client_id": self.client_id,
+                                      "listener_id": button[1], "args": []})
+        # Шаг завершён, когда вопрос перерисован и нажатая кнопка удалена
+        deadline = start + timeout
+        while button[0] in self.elements:
+            if not await self.wait_update(deadline - time.perf_counter()):
+                raise TimeoutError(f"Нет ответа на нажатие '{label}'")
+        return time.perf_counter() - start
+
+    async def navigate(self, path: str, timeout: float) -> float:
+        """
+        Перейти на страницу внутри соединения и дождаться обновления. Возвращает задержку перехода.
+
+        Отправляется то же событие роутера, что и браузер при переходе по истории (popstate).
+        """
+        listener_id = next((event["listener_id"] for event in self.elements["0"].get("events", [])
+                            if event["type"] == "router_open"), None)
+        if listener_id is None:
+            raise RuntimeError("Страница открыта не в одностраничном режиме")
+        self._updated.clear()
+        start = time.perf_counter()
+        await self.sio.emit("event", {"id": 0, "client_id": self.client_id,
+                                      "listener_id": listener_id, "args": [json.dumps(path)]})
+        if not await self.wait_update(timeout):
+            raise TimeoutError(f"Нет ответа на переход на {path}")
+        return time.perf_counter() - start
+
+    async def close(self) -> None:
+        if self.sio is not None:
+            await self.sio.disconnect()
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.base_url = f"http://127.0.0.1:{args.port}"
+        self.page_loads: List[float] = []
+        self.steps: List[float] = []
+        self.navigations: List[float] = []
+        self.questions: List[int] = []
+        self.errors: List[str] = []
+        self.probes: List[float] = []
+        self.sessions: List[PageSession] = []
+
+    async def consultant(self, http: httpx.AsyncClient, seed: int) -> None:
+        rnd = random.Random(seed)
+        session = PageSession(self.base_url, http)
+        self.sessions.append(session)
+        self.page_loads.append(await session.open("/cons"))
+        asked = 0
+        while asked < self.args.max_questions:
+            await asyncio.sleep(self.args.think_time)
+            step = await session.click(rnd.choice(ANSWERS), self.args.timeout)
+            if step is None:
+                break  # Кнопок ответа нет — консультация завершена
+            self.steps.append(step)
+            asked += 1
+        self.questions.append(asked)
+
+    async def editor(self, http: httpx.AsyncClient, seed: int, rule_ids: List[str]) -> None:
+        rnd = random.Random(seed)
+        session = None
+        for i in range(self.args.editor_steps):
+            await asyncio.sleep(self.args.think_time)
+            path = "/rules" if i % 2 == 0 else f"/rule/{rnd.choice(rule_ids)}"
+            if session is not None and not self.args.pages:
+                self.navigations.append(await session.navigate(path, self.args.timeout))
+                continue
+            session = PageSession(self.base_url, http)
+            self.sessions.append(session)
+            self.page_loads.append(await session.open(path))
+
+    async def probe(self, stop: asyncio.Event) -> None:
+        """Время ответа на лёгкий запрос, пока идёт нагрузка."""
+        async with httpx.AsyncClient() as http:
+            while not stop.is_set():
+                start = time.perf_counter()
+                await http.get(self.base_url + PROBE_PATH)
+                self.probes.append(time.perf_counter() - start)
+                await asyncio.sleep(self.args.probe_interval)
+
+    async def idle_probe(self) -> List[float]:
+        samples = []
+        async with httpx.AsyncClient() as http:
+            await http.get(self.base_url + PROBE_PATH)  # Прогрев соединения
+            for _ in range(20):
+                start = time.perf_counter()
+                await http.get(self.base_url + PROBE_PATH)
+                samples.append(time.perf_counter() - start)
+        return samples
+
+    async def run(self, server_pid: int, rule_ids: List[str]) -> Dict:
+        idle = await self.idle_probe()
+        rss_before = server_rss(server_pid)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(self.probe(stop))
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(timeout=self.args.timeout, limits=limits) as http:
+            tasks = [self.consultant(http, i) for i in range(self.args.consultants)]
+            tasks += [self.editor(http, 10_000 + i, rule_ids) for i in range(self.args.editors)]
+            start = time.perf_counter()
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self.errors.append(repr(result))
+            duration = time.perf_counter() - start
+            # Память замеряется, пока все сессии ещё подключены
+            rss_peak = server_rss(server_pid)
+            for session in self.sessions:
+                await session.close()
+        stop.set()
+        await probe_task
+
+        idle_p50 = percentile(idle, 0.5)
+        return {
+            "duration": duration,
+            "page_load": summarize(self.page_loads),
+            "step_latency": summarize(self.steps),
+            "navigation": summarize(self.navigations),
+            "questions_per_session": summarize([float(q) for q in self.questions]),
+            "memory": {
+                "rss_before": rss_before,
+                "rss_peak": rss_peak,
+                "per_session": (rss_peak - rss_before) / max(1, len(self.sessions)),
+            },
+            "event_loop_lag": {
+                "idle_probe_p50": idle_p50,
+                **{k: max(0.0, v - idle_p50) if k in ("p50", "p99", "mean", "max") else v
+                   for k, v in summarize(self.probes).items()},
+            },
+            "errors": self.errors,
+        }
+
+
+def wait_for_server(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Сервер завершился с кодом {process.returncode}")
+        try:
+            httpx.get(url + PROBE_PATH, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise TimeoutError("Сервер не запустился")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочное тестирование экспертной системы")
+    parser.add_argument("--consultants", type=int, default=10, help="Одновременные консультации")
+    parser.add_argument("--editors", type=int, default=2, help="Одновременные редакторы правил")
+    parser.add_argument("--editor-steps", type=int, default=10, help="Переходов между страницами на редактора")
+    parser.add_argument("--max-questions", type=int, default=50)
+    parser.add_argument("--think-time", type=float, default=0.05, help="Пауза клиента между шагами, секунды")
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", action="store_true",
+                        help="Запустить приложение с --pages: каждая страница загружается отдельно")
+    parser.add_argument("--output", help="Файл для JSON-результатов (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    # Правила читаются так же, как их видит сервер: снимок вместе с журналом
+    rule_ids = list(get_journal(DEFAULT_FILE_NAME).load()["rules"])
+
+    command = [sys.executable, "main.py", "--headless", "--port", str(args.port)]
+    if args.pages:
+        command.append("--pages")
+    server = subprocess.Popen(command, cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_server(f"http://127.0.0.1:{args.port}", server)
+        results = asyncio.run(LoadTest(args).run(server.pid, rule_ids))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "args": vars(args)},
+        "results": results,
+    }
+    payload = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(payload)
+    else:
+        print(payload)
+
+    step = results["step_latency"]
+    if step["n"]:
+        print(f"Шаг: p50={step['p50'] * 1000:.1f} мс p99={step['p99'] * 1000:.1f} мс, "
+              f"память на сессию {results['memory']['per_session'] / 1024:.0f} КБ, "
+              f"ошибок: {len(results['errors'])}", file=sys.stderr)
+    navigation = results["navigation"]
+    if navigation["n"]:
+        print(f"Переход: p50={navigation['p50'] * 1000:.1f} мс p99={navigation['p99'] * 1000:.1f} мс",
+              file=sys.stderr)
+    if results["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
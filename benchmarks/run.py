@@ -0,0 +1,233 @@
+"""
+Бенчмарки механизма вывода, хранилища и построения страниц на синтетических базах знаний.
+
+Запуск из корня репозитория:
+    python -m benchmarks.run --sizes 1000 10000 --output bench.json
+    python -m benchmarks.run --sizes 1000 10000 --baseline bench.json --threshold 0.2
+
+Полный набор добавляет построение страниц на базе из 100 000 правил (несколько минут
+и несколько гигабайт памяти на одну сборку страницы правил):
+    python -m benchmarks.run --sizes 1000 10000 --ui-sizes 100000 --output bench-full.json
+
+Результаты пишутся в JSON. При указании --baseline медианы сравниваются с сохранёнными,
+и при замедлении больше порога процесс завершается с кодом 1.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.kb_generator import write_kb
+
+Results = Dict[str, Dict[str, float]]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Статистика по замерам в секундах."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+    }
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> List[float]:
+    """Замерить время выполнения func; setup вызывается перед каждым замером и в него не входит."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# --- Механизм вывода ---
+
+def bench_engine(file_name: str, sessions: int, seed: int) -> Results:
+    from engine.consultant import Consultant
+
+    rnd = random.Random(seed)
+    load, latencies, questions = [], [], []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        consultant = Consultant(file_name)
+        load.append(time.perf_counter() - start)
+
+        asked = 0
+        while True:
+            start = time.perf_counter()
+            fact = consultant.process_rules()
+            latencies.append(time.perf_counter() - start)
+            if not fact:
+                break
+            asked += 1
+            consultant.answer_question(fact, rnd.choice((1, 0, None)))
+        questions.append(asked)
+
+    return {
+        "engine.load": summarize(load),
+        "engine.process_rules": summarize(latencies),
+        "engine.questions_per_session": {"n": len(questions), "mean": statistics.fmean(questions),
+                                         "median": statistics.median(questions), "max": max(questions)},
+    }
+
+
+# --- Хранилище ---
+
+def bench_storage(file_name: str, repeat: int) -> Results:
+    from engine.manager import RulesFactsManager
+
+    manager = RulesFactsManager(file_name)
+    rule_ids = list(manager.get_rules())
+    middle = rule_ids[len(rule_ids) // 2]
+    fact = next(iter(manager.get_facts()))
+
+    results = {
+        "storage.load": summarize(measure(lambda: RulesFactsManager(file_name), repeat)),
+        "storage.copy": summarize(measure(manager.copy, repeat)),
+        "storage.move_rule_up": summarize(measure(lambda: manager.move_rule_up(middle), repeat)),
+        "storage.move_rule_down": summarize(measure(lambda: manager.move_rule_down(middle), repeat)),
+        # Удаление неиспользуемого факта проходит по всем правилам
+        "storage.delete_fact": summarize(measure(
+            lambda: manager.delete_fact("__bench__"), repeat,
+            setup=lambda: manager.add_fact("__bench__", "?"))),
+        "storage.save": summarize(measure(
+            manager.save, repeat,
+            setup=lambda: manager.update_fact_question(fact, f"Вопрос {time.perf_counter()}?"))),
+    }
+    results["storage.compact"] = summarize(measure(manager.compact, 1))
+    return results
+
+
+# --- Страницы ---
+
+def bench_pages(file_name: str, repeat: int) -> Results:
+    from nicegui import Client
+    from nicegui.page import page
+
+    import pages
+    from engine.manager import RulesFactsManager
+
+    pages.set_rules_manager(RulesFactsManager(file_name))
+    try:
+        results = {}
+        for name, builder in (("ui.rules_page", pages.rules_page), ("ui.facts_page", pages.facts_page)):
+            samples = []
+            for _ in range(repeat):
+                client = Client(page('/bench'))
+                start = time.perf_counter()
+                with client:
+                    builder()
+                samples.append(time.perf_counter() - start)
+                client.delete()
+            results[name] = summarize(samples)
+        return results
+    finally:
+        pages.set_rules_manager(None)
+
+
+# --- Сравнение с базовой линией ---
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """Вернуть описания замедлений медианы больше чем в (1 + threshold) раз."""
+    regressions = []
+    for key, stats in results.items():
+        old = baseline.get(key)
+        if not old or not old.get("median") or "median" not in stats:
+            continue
+        ratio = stats["median"] / old["median"]
+        stats["baseline_median"] = old["median"]
+        stats["ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {old['median']:.6f} -> {stats['median']:.6f} (x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки экспертной системы")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Количество правил в генерируемых базах знаний")
+    parser.add_argument("--facts-ratio", type=float, default=0.2, help="Доля фактов от количества правил")
+    parser.add_argument("--fan-in", type=int, default=3)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--conflict-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sessions", type=int, default=10, help="Количество консультаций на размер базы")
+    parser.add_argument("--skip-ui", action="store_true", help="Не замерять построение страниц")
+    parser.add_argument("--ui-sizes", type=int, nargs="*", default=[],
+                        help="Размеры баз, на которых замеряется только построение страниц (по одной сборке)")
+    parser.add_argument("--output", help="Файл для JSON-результатов (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="JSON-результаты предыдущего запуска для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Допустимое относительное замедление")
+    args = parser.parse_args()
+
+    # Отладочный лог консультанта пишет каждое правило и искажал бы замеры
+    logging.disable(logging.CRITICAL)
+
+    results: Results = {}
+    ui_only = [size for size in args.ui_sizes if size not in args.sizes] if not args.skip_ui else []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes + ui_only:
+            file_name = os.path.join(tmp, f"kb_{size}.json")
+            params = dict(rules=size, facts=max(20, int(size * args.facts_ratio)), fan_in=args.fan_in,
+                          depth=args.depth, conflict_rate=args.conflict_rate, seed=args.seed)
+            write_kb(file_name, **params)
+            print(f"База знаний: {params}", file=sys.stderr)
+
+            size_results = {}
+            if size in ui_only:
+                # Консультации на таких базах идут минутами, замеряются только страницы
+                size_results.update(bench_pages(file_name, 1))
+            else:
+                size_results.update(bench_engine(file_name, args.sessions, args.seed))
+                size_results.update(bench_storage(file_name, args.repeat))
+                if not args.skip_ui:
+                    size_results.update(bench_pages(file_name, max(1, min(args.repeat, 3))))
+            for key, stats in size_results.items():
+                results[f"{size}/{key}"] = stats
+                print(f"{size:>8} {key:<34} median={stats['median']:.6f}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare(results, json.load(file).get("results", {}), args.threshold)
+        report["regressions"] = regressions
+
+    payload = json.dumps(report, ensure_ascii=False, indent=4)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(payload)
+    else:
+        print(payload)
+
+    if regressions:
+        print("Замедления относительно базовой линии:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
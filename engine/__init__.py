@@ -0,0 +1,26 @@
+"""
+Механизм вывода и хранилище базы знаний без зависимостей от интерфейса.
+
+Модули подгружаются при первом обращении к атрибуту, поэтому `import engine`
+не читает файлов и не импортирует ничего лишнего.
+"""
+import importlib
+
+_EXPORTS = {
+    "Consultant": "engine.consultant",
+    "RulesFactsManager": "engine.manager",
+    "KnowledgeBaseJournal": "engine.journal",
+    "get_journal": "engine.journal",
+    "Fact": "engine.model",
+    "Rule": "engine.model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'engine' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,182 @@
+import logging
+import os
+from typing import Dict, List, Tuple, Union
+
+from engine.journal import DEFAULT_FILE_NAME, get_journal
+from engine.model import Rule, facts_from_json, rules_from_json
+
+# Значение факта, которого ещё нет. None занят ответом «Не знаю».
+MISSING = object()
+
+
+class Consultant:
+    def __init__(self, file_name: str = None, action_key="действие"):
+        """
+        Класс для управления правилами и фактами.
+
+        :param file_name: Имя файла для сохранения и загрузки данных.
+        :param action_key: Ключ для действий в правилах.
+        """
+        if file_name is None:
+            file_name = DEFAULT_FILE_NAME
+        self.file_name = file_name
+        self.action_key = action_key
+        self.facts = {}
+        self._data = self._load_data()
+        self.rules_by_id = rules_from_json(self._data.get("rules", {}))
+        self.rules = self._prepare_rules()
+        self.questions = facts_from_json(self._data.get('facts', {}))
+        self.suggested_actions = []
+        self.process_actions = []
+        self._fired_rules = set()
+        self.result = None
+        self._build_index()
+
+    def _build_index(self):
+        """
+        Строит индексы для трёхзначной логики.
+
+        Для каждого правила хранится число условий, противоречащих известным фактам.
+        Правило с ненулевым счётчиком мертво: его условия не могут выполниться, пока
+        факт не будет перезаписан другим правилом. Ответ «Не знаю» (None) противоречит
+        любому условию со значением 1 или 0, поэтому сразу помечает мёртвыми все
+        зависящие от факта правила.
+        """
+        self._dependents: Dict[str, List[Tuple[int, object]]] = {}
+        self._produced_values = set()
+        for ind, (_, rule) in enumerate(self.rules):
+            for fact, value in rule.conditions:
+                self._dependents.setdefault(fact, []).append((ind, value))
+            for fact, value in rule.actions:
+                if fact != self.action_key:
+                    self._produced_values.add((fact, value))
+        self._conflicts = [0] * len(self.rules)
+        self._useful: Dict[int, bool] = {}
+
+    def _prepare_rules(self) -> List[Tuple[str, Rule]]:
+        """Подготавливает пары (идентификатор, правило), сортируя их по идентификатору."""
+        logging.debug("Подготовка правил: сортировка по идентификатору")
+        return sorted(self.rules_by_id.items(), key=lambda x: int(x[0]))
+
+    def get_rule(self, rule_id: str) -> Rule:
+        """Возвращает правило по идентификатору."""
+        return self.rules_by_id[rule_id]
+
+    def get_question(self, fact: str) -> str:
+        """Возвращает текст вопроса для факта."""
+        fact = self.questions.get(fact)
+        if fact is None or fact.question is None:
+            return ""
+        return fact.question
+
+    def _set_fact(self, fact: str, value):
+        """Записывает факт и обновляет счётчики конфликтов зависящих от него правил."""
+        old = self.facts.get(fact, MISSING)
+        self.facts[fact] = value
+        if old is not MISSING and old == value:
+            return
+        for ind, expected in self._dependents.get(fact, ()):
+            was_conflict = old is not MISSING and old != expected
+            is_conflict = value != expected
+            self._conflicts[ind] += is_conflict - was_conflict
+        self._useful.clear()
+
+    def _can_revive(self, ind: int) -> bool:
+        """Может ли правило ожить: каждый конфликтующий факт может перезаписать какое-либо правило."""
+        if not self._conflicts[ind]:
+            return True
+        for fact, value in self.rules[ind][1].conditions:
+            current = self.facts.get(fact, MISSING)
+            if current is not MISSING and current != value and (fact, value) not in self._produced_values:
+                return False
+        return True
+
+    def _leads_to_action(self, ind: int) -> bool:
+        """
+        Может ли правило ещё привести к новому действию.
+
+        Правило полезно, если оно само добавляет несработавшее действие или выводит
+        (с любым значением) факт, который ещё не выполнен в условии другого полезного
+        правила. Правила, питающие только мёртвые или сработавшие правила, бесполезны,
+        и вопросы для них не задаются. Результаты кешируются до изменения фактов.
+        """
+        if ind not in self._useful:
+            self._useful[ind] = self._search_action(ind, set())
+        return self._useful[ind]
+
+    def _search_action(self, ind: int, visited: set) -> bool:
+        if self._useful.get(ind):
+            return True
+        visited.add(ind)
+        rule = self.rules[ind][1]
+        if rule in self._fired_rules or not self._can_revive(ind):
+            return False
+        for fact, _ in rule.actions:
+            if fact == self.action_key:
+                return True
+            for consumer, expected in self._dependents.get(fact, ()):
+                if consumer not in visited and self.facts.get(fact, MISSING) != expected \
+                        and self._search_action(consumer, visited):
+                    self._useful[ind] = True
+                    return True
+        return False
+
+    def process_rules(self):
+        """Обрабатывает правила: проверяет условия и добавляет факты, если правило выполнено."""
+        logging.info("Начинаем обработку правил")
+        # Факт, выведенный в конце прохода, может оживить уже пройденное правило,
+        # поэтому проход повторяется, пока в нём срабатывают правила
+        fired = True
+        while fired:
+            fired = False
+            for ind, (rule_id, rule) in enumerate(self.rules):
+                # Мёртвые правила пропускаются без проверки условий
+                if self._conflicts[ind]:
+                    continue
+                logging.debug(f"Текущее правило: {rule}")
+
+                # Проверяем выполнение условий
+                missing = next((fact for fact, _ in rule.conditions if fact not in self.facts), None)
+                if missing is not None:
+                    if not self._leads_to_action(ind):
+                        logging.debug(f"Пропускаем вопрос {missing}: правило не ведёт к действию")
+                        continue
+                    logging.info(f"Не хватает факта для выполнения правила: {missing}")
+                    return missing
+
+                if rule not in self._fired_rules:
+                    # Применяем действия, если все условия выполнены
+                    self._apply_then(rule_id, rule)
+                    fired = True
+
+        logging.info("Обработка правил завершена")
+
+    def _apply_then(self, rule_id: str, rule: Rule):
+        """Применяет действия из блока "then"."""
+        then_conditions = dict(rule.actions)
+        logging.info(f"Добавляем факты: {then_conditions}")
+        for fact, value in rule.actions:
+            self._set_fact(fact, value)
+
+        if self.action_key in then_conditions:
+            logging.info(f"Добавлено действие: {then_conditions[self.action_key]}")
+            self.suggested_actions.append(then_conditions[self.action_key])
+
+        self.process_actions.append(rule_id)
+        self._fired_rules.add(rule)
+        self._useful.clear()
+        logging.debug(f"Текущее состояние фактов: {self.facts}")
+
+    def _load_data(self) -> Dict[str, Union[Dict, None]]:
+        """Загрузка данных из JSON файла с применением журнала изменений."""
+        if not os.path.exists(self.file_name):
+            logging.error(f"Файл {self.file_name} не найден. Используем пустые данные.")
+        data = get_journal(self.file_name).load()
+        logging.info(f"Данные успешно загружены из {self.file_name}")
+        return data
+
+    def answer_question(self, fact: str, answer: Union[int, None]):
+        """Добавляет ответ на вопрос в факты."""
+        logging.info(f"Получен ответ на вопрос: {fact} = {answer}")
+        self._set_fact(fact, answer)
+        logging.debug(f"Обновленное состояние фактов: {self.facts}")
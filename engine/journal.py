@@ -0,0 +1,346 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка действует только внутри процесса
+    fcntl = None
+
+# Операции журнала. Каждая операция задаёт итоговое значение ключа целиком,
+# поэтому повторное применение журнала к уже обновлённому снимку безопасно.
+SET_FACT = "set_fact"
+DEL_FACT = "del_fact"
+SET_RULE = "set_rule"
+DEL_RULE = "del_rule"
+
+DEFAULT_FILE_NAME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'base.json')
+
+COMPACT_INTERVAL = 30.0  # Период фоновой проверки журнала, секунды
+COMPACT_THRESHOLD = 500  # Количество операций, после которого журнал сворачивается в снимок
+SYNC_DELAY = 0.2  # Окно группового fsync: записи за это время сбрасываются на диск одним вызовом
+
+
+def empty_data() -> Dict[str, Dict]:
+    return {'rules': {}, 'facts': {}}
+
+
+def apply_op(data: Dict[str, Dict], op: Dict) -> None:
+    """Применить одну операцию журнала к данным в формате JSON-файла."""
+    kind = op["op"]
+    if kind == SET_FACT:
+        data['facts'][op["id"]] = op["value"]
+    elif kind == DEL_FACT:
+        data['facts'].pop(op["id"], None)
+    elif kind == SET_RULE:
+        data['rules'][op["id"]] = op["value"]
+    elif kind == DEL_RULE:
+        data['rules'].pop(op["id"], None)
+    else:
+        raise ValueError(f"Неизвестная операция журнала: {kind}")
+
+
+class KnowledgeBaseJournal:
+    """
+    Журнал изменений базы знаний.
+
+    Снимок хранится в исходном JSON-файле, изменения дописываются построчно
+    в файл `<file_name>.journal`. При загрузке журнал применяется поверх снимка,
+    фоновое сворачивание периодически записывает новый снимок и обрезает журнал.
+
+    Чтение, запись и сворачивание выполняются под блокировкой файла `<file_name>.lock`,
+    поэтому одну базу могут открывать несколько процессов. Дописанные записи
+    сбрасываются на диск групповым fsync не позже чем через sync_delay секунд.
+    """
+
+    def __init__(self, file_name: str, compact_interval: float = COMPACT_INTERVAL,
+                 compact_threshold: int = COMPACT_THRESHOLD, sync_delay: float = SYNC_DELAY):
+        self.file_name = file_name
+        self.journal_name = file_name + ".journal"
+        self.lock_name = file_name + ".lock"
+        self.compact_interval = compact_interval
+        self.compact_threshold = compact_threshold
+        self.sync_delay = sync_delay
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._tail_checked = False
+        self._entries: Optional[int] = None
+        self._stop = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        self._sync_pending = threading.Event()
+        self._syncer: Optional[threading.Thread] = None
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        """Блокировка журнала внутри процесса и между процессами."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            # Отдельный файл блокировки: журнал и снимок заменяются при сворачивании,
+            # и блокировка на заменённом файле не защищала бы новый
+            with open(self.lock_name, 'a') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    # --- Чтение ---
+
+    def _load_snapshot(self) -> Dict[str, Dict]:
+        """Загрузка снимка. Повреждённый снимок не подменяется пустой базой."""
+        try:
+            with open(self.file_name, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return empty_data()
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Снимок базы знаний {self.file_name} повреждён: {e}") from e
+        data.setdefault('rules', {})
+        data.setdefault('facts', {})
+        return data
+
+    def _read_ops(self) -> Tuple[List[Dict], int]:
+        """
+        Прочитать операции журнала.
+
+        :return: Список операций и размер прочитанной целой части журнала в байтах.
+        """
+        try:
+            with open(self.journal_name, 'rb') as file:
+                raw = file.read()
+        except FileNotFoundError:
+            return [], 0
+
+        ops = []
+        size = 0
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                # Недописанная при сбое строка, она будет отброшена
+                break
+            try:
+                ops.append(json.loads(line))
+            except json.JSONDecodeError:
+                logging.error(f"Повреждённая запись в журнале {self.journal_name}, остаток журнала пропущен")
+                break
+            size += len(line)
+        return ops, size
+
+    def load(self) -> Dict[str, Dict]:
+        """Загрузить снимок и применить к нему журнал."""
+        # Снимок и журнал читаются под одной блокировкой, чтобы не попасть между их заменами
+        with self._locked(shared=True):
+            data = self._load_snapshot()
+            ops, _ = self._read_ops()
+        for op in ops:
+            apply_op(data, op)
+        self._entries = len(ops)
+        return data
+
+    # --- Запись ---
+
+    def append(self, ops: Iterable[Dict]) -> None:
+        """
+        Дописать пачку операций в журнал.
+
+        Записи сразу видны другим процессам, а на диск сбрасываются фоновым
+        групповым fsync. Для немедленной записи на диск вызовите sync().
+        """
+        lines = [json.dumps(op, ensure_ascii=False) + "\n" for op in ops]
+        if not lines:
+            return
+        with self._locked():
+            self._truncate_torn_tail()
+            with open(self.journal_name, 'a', encoding='utf-8') as file:
+                file.writelines(lines)
+            if self._entries is not None:
+                self._entries += len(lines)
+        self._schedule_sync()
+
+    def _truncate_torn_tail(self) -> None:
+        """Обрезать недописанную последнюю строку, чтобы новые записи не склеились с ней."""
+        # Полная проверка выполняется один раз, дальше достаточно последнего байта:
+        # недописанный хвост мог оставить только упавший процесс
+        if self._tail_checked and self._ends_with_newline():
+            return
+        self._tail_checked = True
+        try:
+            size = os.path.getsize(self.journal_name)
+        except FileNotFoundError:
+            return
+        _, valid = self._read_ops()
+        if valid != size:
+            with open(self.journal_name, 'r+b') as file:
+                file.truncate(valid)
+
+    def _ends_with_newline(self) -> bool:
+        try:
+            with open(self.journal_name, 'rb') as file:
+                if file.seek(0, os.SEEK_END) == 0:
+                    return True
+                file.seek(-1, os.SEEK_END)
+                return file.read(1) == b"\n"
+        except FileNotFoundError:
+            return True
+
+    def _write_atomic(self, file_name: str, payload: bytes) -> None:
+        """Записать файл целиком через временный файл и os.replace."""
+        tmp_name = file_name + ".tmp"
+        with open(tmp_name, 'wb') as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_name, file_name)
+        self._sync_directory(file_name)
+
+    @staticmethod
+    def _sync_directory(file_name: str) -> None:
+        """Сбросить на диск запись каталога, чтобы переименование пережило сбой питания."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(file_name)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # --- Групповой fsync ---
+
+    def sync(self) -> None:
+        """Сбросить дописанные записи журнала на диск."""
+        # Флаг снимается до fsync: записи, дописанные во время сброса, запланируют следующий
+        self._sync_pending.clear()
+        try:
+            with open(self.journal_name, 'ab') as file:
+                os.fsync(file.fileno())
+        except FileNotFoundError:
+            pass
+
+    def _schedule_sync(self) -> None:
+        if self._stop.is_set():
+            # Журнал закрыт и фоновый поток остановлен: запись сбрасывается сразу
+            self.sync()
+            return
+        self._sync_pending.set()
+        if self._syncer is None:
+            self._syncer = threading.Thread(target=self._sync_loop, name="kb-journal-sync", daemon=True)
+            self._syncer.start()
+
+    def _sync_loop(self) -> None:
+        while not self._stop.is_set():
+            self._sync_pending.wait()
+            # Ждём окно, чтобы собрать в один fsync все сохранения за это время
+            self._stop.wait(self.sync_delay)
+            try:
+                self.sync()
+            except Exception:
+                logging.exception(f"Не удалось сбросить журнал {self.journal_name} на диск")
+
+    # --- Сворачивание ---
+
+    def compact(self) -> None:
+        """Записать новый снимок с учётом журнала и удалить применённые записи."""
+        with self._compact_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        with self._locked():
+            self._truncate_torn_tail()
+            ops, offset = self._read_ops()
+            journal_id = self._journal_id()
+        if not ops:
+            return
+
+        # Снимок строится вне блокировки: новые записи продолжают дописываться в журнал
+        data = self._load_snapshot()
+        for op in ops:
+            apply_op(data, op)
+        payload = json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
+
+        with self._locked():
+            if self._journal_id() != journal_id:
+                # Журнал уже свёрнут другим процессом, прочитанные операции устарели
+                logging.info(f"Журнал {self.journal_name} уже свёрнут, сворачивание пропущено")
+                return
+            self._write_atomic(self.file_name, payload)
+            # Сбой до обрезки журнала безопасен: операции идемпотентны
+            with open(self.journal_name, 'rb') as file:
+                file.seek(offset)
+                tail = file.read()
+            self._write_atomic(self.journal_name, tail)
+            if self._entries is not None:
+                self._entries = max(self._entries - len(ops), 0)
+        logging.info(f"Журнал {self.journal_name} свёрнут в снимок ({len(ops)} операций)")
+
+    def _journal_id(self) -> Optional[int]:
+        """Номер inode журнала: он меняется только при замене журнала сворачиванием."""
+        try:
+            return os.stat(self.journal_name).st_ino
+        except FileNotFoundError:
+            return None
+
+    def start_compactor(self) -> None:
+        """
+        Запустить фоновое сворачивание журнала.
+
+        Вызывается только процессом, который изменяет базу знаний: процессы, которые
+        лишь читают её, не должны переписывать снимок.
+        """
+        if self.compact_interval is None or self._compactor is not None:
+            return
+        self._compactor = threading.Thread(target=self._compact_loop, name="kb-journal-compactor", daemon=True)
+        self._compactor.start()
+
+    def _compact_loop(self) -> None:
+        while not self._stop.wait(self.compact_interval):
+            if (self._entries or 0) < self.compact_threshold:
+                continue
+            try:
+                self.compact()
+            except Exception:
+                logging.exception(f"Не удалось свернуть журнал {self.journal_name}")
+
+    def close(self) -> None:
+        """
+        Остановить фоновые потоки и сбросить журнал на диск.
+
+        Журналом можно пользоваться и после закрытия, но записи тогда сбрасываются
+        на диск синхронно при каждом append().
+        """
+        self._stop.set()
+        self._sync_pending.set()
+        for thread in (self._compactor, self._syncer):
+            if thread is not None:
+                thread.join()
+        self._compactor = None
+        self._syncer = None
+        self.sync()
+
+
+_journals: Dict[str, KnowledgeBaseJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(file_name: str) -> KnowledgeBaseJournal:
+    """Общий журнал для файла, чтобы все менеджеры одного файла писали под одной блокировкой."""
+    key = os.path.abspath(file_name)
+    with _journals_lock:
+        if key not in _journals:
+            _journals[key] = KnowledgeBaseJournal(file_name)
+        return _journals[key]
+
+
+def close_journals() -> None:
+    """Свернуть журналы всех открытых баз знаний в снимки и закрыть их (при завершении приложения)."""
+    with _journals_lock:
+        journals = list(_journals.values())
+    for journal in journals:
+        try:
+            journal.compact()
+        except Exception:
+            logging.exception(f"Не удалось свернуть журнал {journal.journal_name}")
+        journal.close()
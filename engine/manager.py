@@ -0,0 +1,234 @@
+from typing import Dict, List, Union
+
+from engine.journal import DEFAULT_FILE_NAME, DEL_FACT, DEL_RULE, SET_FACT, SET_RULE, get_journal
+from engine.model import Fact, Rule, facts_from_json, facts_to_json, rules_from_json, rules_to_json
+
+
+class RulesFactsManager:
+    def __init__(self, file_name: str = None, action_key="действие"):
+        """
+        Класс для управления правилами и фактами.
+
+        :param file_name: Имя файла для сохранения и загрузки данных.
+        """
+        if file_name is None:
+            file_name = DEFAULT_FILE_NAME
+
+        self.file_name = file_name
+        self.action_key = action_key
+        self._journal = get_journal(file_name)
+        self._facts: Dict[str, Fact] = {}
+        self._rules: Dict[str, Rule] = {}
+        # Изменённые с последнего сохранения ключи (dict используется как упорядоченное множество)
+        self._dirty_facts: Dict[str, None] = {}
+        self._dirty_rules: Dict[str, None] = {}
+        # Номер версии данных, растёт при каждом изменении и перезагрузке
+        self.revision = 0
+        self.reload_data()
+        # Снимок сворачивает только изменяющий базу процесс, консультанты лишь читают её
+        self._journal.start_compactor()
+
+    # --- Загрузка и сохранение данных ---
+
+    def _load_data(self) -> Dict[str, Union[Dict, None]]:
+        """Загрузка снимка из JSON файла с применением журнала изменений."""
+        return self._journal.load()
+
+    def _save_data(self) -> None:
+        """Дописать изменённые правила и факты в журнал."""
+        self._journal.append(self._pending_ops())
+        self._dirty_facts.clear()
+        self._dirty_rules.clear()
+
+    def _pending_ops(self) -> List[Dict]:
+        """Операции журнала для всех изменённых с последнего сохранения ключей."""
+        ops = []
+        for fact_id in self._dirty_facts:
+            if fact_id in self._facts:
+                ops.append({"op": SET_FACT, "id": fact_id, "value": self._facts[fact_id].question})
+            else:
+                ops.append({"op": DEL_FACT, "id": fact_id})
+        for rule_id in self._dirty_rules:
+            if rule_id in self._rules:
+                ops.append({"op": SET_RULE, "id": rule_id, "value": self._rules[rule_id].to_dict()})
+            else:
+                ops.append({"op": DEL_RULE, "id": rule_id})
+        return ops
+
+    def to_json(self) -> Dict[str, Dict]:
+        """Представление базы знаний в формате JSON-файла."""
+        return {'facts': facts_to_json(self._facts), 'rules': rules_to_json(self._rules)}
+
+    def save(self) -> None:
+        """Сохранить изменения и добавить отсутствующие факты."""
+        self._sync_facts_with_rules()
+        self._save_data()
+
+    def compact(self) -> None:
+        """Свернуть журнал изменений в новый снимок."""
+        self._journal.compact()
+
+    def reload_data(self) -> None:
+        """Перезагрузка данных из файла."""
+        data = self._load_data()
+        self._facts = facts_from_json(data.get('facts', {}))
+        self._rules = rules_from_json(data.get('rules', {}))
+        self._dirty_facts.clear()
+        self._dirty_rules.clear()
+        self.revision += 1
+
+    def _touch_fact(self, fact_id: str) -> None:
+        self._dirty_facts[fact_id] = None
+        self.revision += 1
+
+    def _touch_rule(self, rule_id: str) -> None:
+        self._dirty_rules[rule_id] = None
+        self.revision += 1
+
+    # --- Управление фактами ---
+
+    def get_facts(self) -> Dict[str, Fact]:
+        """Получить все факты."""
+        return self._facts
+
+    def update_fact_question(self, fact_id: str, description: str) -> None:
+        if fact_id in self._facts:
+            self._facts[fact_id].question = description
+            self._touch_fact(fact_id)
+
+    def add_fact(self, fact_id: str, description: str) -> None:
+        """Добавить факт."""
+        fact = Fact(fact_id, description)
+        self._facts[fact.name] = fact
+        self._touch_fact(fact.name)
+
+    def delete_fact(self, fact_id: str) -> bool:
+        """Удалить факт. Нельзя удалить факт, если он используется в правилах или имеет ключ self.action_key."""
+        if fact_id == self.action_key:
+            raise ValueError(f"Невозможно удалить факт с ключом '{self.action_key}'.")
+
+        # Проверяем, используется ли факт в правилах
+        for rule_id, rule in self._rules.items():
+            if rule.uses(fact_id):
+                raise ValueError(f"Факт '{fact_id}' используется в правиле '{rule_id}' и не может быть удалён.")
+
+        # Удаляем факт, если он не используется
+        if self._facts.pop(fact_id, None) is None:
+            return False
+        self._touch_fact(fact_id)
+        return True
+
+    # --- Управление правилами ---
+
+    def get_rules(self) -> Dict[str, Rule]:
+        """Получить все правила."""
+        return self._rules
+
+    def get_rule(self, rule_id: str) -> Rule:
+        """Получить правило по идентификатору."""
+        if rule_id in self._rules:
+            return self._rules[rule_id]
+        raise KeyError(f"Rule with ID {rule_id} does not exist.")
+
+    def add_rule(self, rule_id: str, rule: Union[Rule, Dict[str, Dict]]) -> None:
+        """Добавить правило."""
+        self._rules[rule_id] = rule if isinstance(rule, Rule) else Rule.from_dict(rule)
+        self._touch_rule(rule_id)
+
+    def add_blank_rule(self) -> None:
+        """Добавить пустое правило с уникальным идентификатором."""
+        rule_id = str(max(map(int, self._rules.keys()), default=0) + 1)
+        self._rules[rule_id] = Rule({}, {self.action_key: None})
+        self._touch_rule(rule_id)
+
+    def delete_rule(self, rule_id: str) -> bool:
+        """Удалить правило по его идентификатору."""
+        if self._rules.pop(rule_id, None) is None:
+            return False
+        self._touch_rule(rule_id)
+        return True
+
+    def edit_rule(self, rule_id: str, new_rule: Union[Rule, Dict[str, Dict]]) -> None:
+        """Изменить правило."""
+        if rule_id in self._rules:
+            self._rules[rule_id] = new_rule if isinstance(new_rule, Rule) else Rule.from_dict(new_rule)
+            self._touch_rule(rule_id)
+        else:
+            raise KeyError(f"Rule with ID {rule_id} does not exist.")
+
+    def move_rule_up(self, ind):
+        keys = list(self.get_rules().keys())
+        current_idx = keys.index(ind)
+        if current_idx > 0:
+            swap_ind = keys[current_idx - 1]
+            self._swap_rules(ind, swap_ind)
+
+    def move_rule_down(self, ind):
+        keys = list(self.get_rules().keys())
+        current_idx = keys.index(ind)
+        if current_idx < len(keys) - 1:
+            swap_ind = keys[current_idx + 1]
+            self._swap_rules(ind, swap_ind)
+
+    def _swap_rules(self, ind1, ind2):
+        # Правила неизменяемы, поэтому достаточно обменять ссылки
+        rule1 = self.get_rule(ind1)
+        rule2 = self.get_rule(ind2)
+        self.edit_rule(ind1, rule2)
+        self.edit_rule(ind2, rule1)
+
+    def set_then(self, rule_id: str, fact: str, val: int) -> None:
+        """Установить действие (then) для правила."""
+        if fact not in self.get_facts():
+            self.add_fact(fact, None)
+        self._rules[rule_id] = self._rules[rule_id].with_actions({fact: val})
+        self._touch_rule(rule_id)
+
+    # --- Управление условиями ---
+
+    def add_condition(self, rule_id: str, fact: str, val: int) -> None:
+        """Добавить условие в правило."""
+        if fact not in self.get_facts():
+            self.add_fact(fact, None)
+        self._rules[rule_id] = self._rules[rule_id].with_condition(fact, val)
+        self._touch_rule(rule_id)
+
+    def delete_condition(self, rule_id: str, condition: str) -> None:
+        """Удалить условие из правила."""
+        self._rules[rule_id] = self._rules[rule_id].without_condition(condition)
+        self._touch_rule(rule_id)
+
+    def delete_all_conditions(self, rule_id: str) -> None:
+        """Удалить все условия из правила."""
+        self._rules[rule_id] = self._rules[rule_id].with_conditions(())
+        self._touch_rule(rule_id)
+
+    # --- Утилиты ---
+
+    def copy(self) -> "RulesFactsManager":
+        """Создать независимую копию объекта без повторного чтения файла."""
+        new_instance = RulesFactsManager.__new__(RulesFactsManager)
+        new_instance.file_name = self.file_name
+        new_instance.action_key = self.action_key
+        new_instance._journal = self._journal
+        new_instance.revision = self.revision
+        new_instance._dirty_facts = dict(self._dirty_facts)
+        new_instance._dirty_rules = dict(self._dirty_rules)
+        # Правила неизменяемы и могут разделяться, факты копируются из-за изменяемого вопроса
+        new_instance._rules = dict(self._rules)
+        new_instance._facts = {name: Fact(name, fact.question) for name, fact in self._facts.items()}
+        return new_instance
+
+    def _sync_facts_with_rules(self) -> None:
+        """Добавить отсутствующие факты из правил."""
+        for rule in self.get_rules().values():
+            for fact in rule.facts():
+                if fact not in self._facts:
+                    self.add_fact(fact, None)
+
+    def check(self) -> None:
+        """Проверить, что все ключи и значения корректны."""
+        for rule_id, rule in self.get_rules().items():
+            for fact in rule.facts():
+                if not isinstance(fact, str):
+                    raise ValueError(f"Invalid fact key in rule {rule_id}: {fact}")
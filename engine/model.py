@@ -0,0 +1,136 @@
+import sys
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+Value = Union[int, str, None]
+Pairs = Tuple[Tuple[str, Value], ...]
+
+
+def intern_fact(name: str) -> str:
+    """Интернирует имя факта, чтобы все правила ссылались на одну строку."""
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+def _to_pairs(items: Union[Dict[str, Value], Iterable[Tuple[str, Value]]]) -> Pairs:
+    """Преобразует словарь или пары (факт, значение) в кортеж с интернированными именами."""
+    if isinstance(items, dict):
+        items = items.items()
+    return tuple((intern_fact(fact), value) for fact, value in items)
+
+
+class Fact:
+    """Факт базы знаний: имя и вопрос пользователю."""
+
+    __slots__ = ("name", "question")
+
+    def __init__(self, name: str, question: Optional[str] = None):
+        self.name = intern_fact(name)
+        self.question = question
+
+    def __eq__(self, other):
+        if not isinstance(other, Fact):
+            return NotImplemented
+        return self.name == other.name and self.question == other.question
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return f"Fact({self.name!r}, {self.question!r})"
+
+
+class Rule:
+    """
+    Неизменяемое правило вида ЕСЛИ conditions ТО actions.
+
+    Условия и действия хранятся кортежами пар (факт, значение) в исходном порядке,
+    который сохраняется при записи и отображении. Сравнение и хеширование от порядка
+    не зависят: правила с переставленными условиями равны.
+    """
+
+    __slots__ = ("conditions", "actions", "_hash")
+
+    def __init__(self, conditions: Union[Dict[str, Value], Iterable] = (),
+                 actions: Union[Dict[str, Value], Iterable] = ()):
+        self.conditions = _to_pairs(conditions)
+        self.actions = _to_pairs(actions)
+        self._hash = hash((frozenset(self.conditions), frozenset(self.actions)))
+
+    # --- Сериализация ---
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Value]]) -> "Rule":
+        """Создать правило из JSON-формата {"if": {...}, "then": {...}}."""
+        return cls(data.get("if", {}), data.get("then", {}))
+
+    def to_dict(self) -> Dict[str, Dict[str, Value]]:
+        """Преобразовать правило в JSON-формат {"if": {...}, "then": {...}}."""
+        return {"if": dict(self.conditions), "then": dict(self.actions)}
+
+    # --- Изменение (возвращают новое правило) ---
+
+    def with_condition(self, fact: str, value: Value) -> "Rule":
+        """Вернуть правило с добавленным или заменённым условием."""
+        fact = intern_fact(fact)
+        conditions = dict(self.conditions)
+        conditions[fact] = value
+        return Rule(conditions, self.actions)
+
+    def without_condition(self, fact: str) -> "Rule":
+        """Вернуть правило без указанного условия."""
+        return Rule([pair for pair in self.conditions if pair[0] != fact], self.actions)
+
+    def with_conditions(self, conditions: Union[Dict[str, Value], Iterable]) -> "Rule":
+        """Вернуть правило с новым блоком "if"."""
+        return Rule(conditions, self.actions)
+
+    def with_actions(self, actions: Union[Dict[str, Value], Iterable]) -> "Rule":
+        """Вернуть правило с новым блоком "then"."""
+        return Rule(self.conditions, actions)
+
+    # --- Доступ ---
+
+    def facts(self) -> Tuple[str, ...]:
+        """Все факты, упоминаемые в правиле."""
+        return tuple(fact for fact, _ in self.conditions) + tuple(fact for fact, _ in self.actions)
+
+    def uses(self, fact: str) -> bool:
+        """Используется ли факт в условиях или действиях правила."""
+        return any(name == fact for name, _ in self.conditions) or any(name == fact for name, _ in self.actions)
+
+    def __eq__(self, other):
+        if not isinstance(other, Rule):
+            return NotImplemented
+        if self._hash != other._hash:
+            return False
+        if self.conditions == other.conditions and self.actions == other.actions:
+            return True
+        return frozenset(self.conditions) == frozenset(other.conditions) \
+            and frozenset(self.actions) == frozenset(other.actions)
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"Rule({dict(self.conditions)!r}, {dict(self.actions)!r})"
+
+
+# --- Преобразование базы знаний ---
+
+def facts_from_json(data: Dict[str, Optional[str]]) -> Dict[str, Fact]:
+    """Преобразовать блок "facts" JSON-файла в словарь фактов."""
+    return {intern_fact(name): Fact(name, question) for name, question in data.items()}
+
+
+def rules_from_json(data: Dict[str, Dict]) -> Dict[str, Rule]:
+    """Преобразовать блок "rules" JSON-файла в словарь правил."""
+    return {rule_id: Rule.from_dict(rule) for rule_id, rule in data.items()}
+
+
+def facts_to_json(facts: Dict[str, Fact]) -> Dict[str, Optional[str]]:
+    """Преобразовать словарь фактов в блок "facts" JSON-файла."""
+    return {name: fact.question for name, fact in facts.items()}
+
+
+def rules_to_json(rules: Dict[str, Rule]) -> Dict[str, Dict]:
+    """Преобразовать словарь правил в блок "rules" JSON-файла."""
+    return {rule_id: rule.to_dict() for rule_id, rule in rules.items()}
@@ -1,36 +1,94 @@
-from nicegui import ui
+import argparse
+import logging
 
-from consultant import ConsultantUI
-from pages import main_page, rules_page, facts_page
-from rule_page import RulePage
+from fastapi import Request
+from nicegui import app, ui
+
+# Настройка логирования
+logging.basicConfig(
+    level=logging.DEBUG,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(),
+        logging.FileHandler("consultant.log", mode='w', encoding='utf-8')
+    ]
+)
+
+# Модули страниц импортируются при первом открытии страницы, а база знаний
+# загружается при первом обращении к менеджеру правил.
 
 
-@ui.page('/')   
 def main_page_view():
+    from pages import main_page
     main_page()
 
 
-@ui.page('/cons')
 def cons_page_view():
+    from consultant import ConsultantUI
     cons = ConsultantUI()
     cons.cons_page()
 
 
-@ui.page('/facts')
 def facts_view():
+    from pages import facts_page
     facts_page()
 
 
-@ui.page('/rules')
 def rules_page_view():
+    from pages import rules_page
     rules_page()
 
 
-@ui.page('/rule/{rule_index}')
 def edit_page_view(rule_index):
+    from rule_page import RulePage
     rule_page = RulePage(rule_index)
 
     rule_page.edit_page()
 
 
-ui.run(native=True)
+# Путь, построитель страницы и кеширование построенного фрейма в одностраничном режиме.
+# Консультация и редактор правила хранят состояние сеанса и строятся заново.
+ROUTES = [
+    ('/', main_page_view, True),
+    ('/cons', cons_page_view, False),
+    ('/facts', facts_view, True),
+    ('/rules', rules_page_view, True),
+    ('/rule/{rule_index}', edit_page_view, False),
+]
+
+
+def spa_view(request: Request):
+    """Одно соединение на клиента: страницы переключаются роутером внутри фрейма."""
+    from pages import get_rules_manager
+    from router import Router
+
+    router = Router(revision=lambda: get_rules_manager().revision)
+    for path, builder, cache in ROUTES:
+        router.add(path, cache)(builder)
+    router.frame().classes("w-full")
+    router.open(request.url.path)
+
+
+@app.on_shutdown
+def close_knowledge_base():
+    """Записать журнал изменений в base.json при завершении, чтобы файл базы знаний был актуален."""
+    from engine.journal import close_journals
+    close_journals()
+
+
+parser = argparse.ArgumentParser(description="Экспертная система")
+parser.add_argument("--headless", action="store_true", help="Запустить веб-сервер без нативного окна")
+parser.add_argument("--port", type=int, default=8080)
+parser.add_argument("--pages", action="store_true",
+                    help="Открывать каждую страницу отдельной загрузкой вместо одностраничного режима")
+args, _ = parser.parse_known_args()
+
+for route_path, route_builder, _ in ROUTES:
+    # В одностраничном режиме любой путь приложения открывает роутер на нужной странице,
+    # остальные пути (статика, favicon, опечатки) обрабатываются как обычно
+    ui.page(route_path)(route_builder if args.pages else spa_view)
+
+if args.headless:
+    ui.run(port=args.port, show=False, reload=False)
+else:
+    ui.run(native=True)
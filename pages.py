@@ -1,6 +1,10 @@
-from nicegui import ui
+import weakref
+from typing import Optional
+
+from nicegui import context, ui
+import router
 from rule_utils import rule_to_text
-from rules_manager import RulesFactsManager
+from engine.manager import RulesFactsManager
 
 # Константы
 CSS_STYLES = """
@@ -12,6 +16,7 @@ CSS_STYLES = """
         filter: brightness(0.95); /* Делаем цвет блеклым */
         transition: filter 0.15s; /* Плавный переход */
     }
+    .nicegui-content:has(.cons-page) { padding: 0; } /* Консультация без отступов страницы */
 """
 
 LABEL_STYLE = 'font-size: 120%'
@@ -20,7 +25,25 @@ ROW_STYLE = "w-full p-2"
 BUTTON_WIDTH = "col-1"
 INPUT_WIDTH = "col-7"
 
-rules_manager = RulesFactsManager()
+_rules_manager = None
+
+# Клиенты, которым стили уже добавлены: в одностраничном режиме страницы строятся
+# многократно внутри одного клиента
+_styled_clients = weakref.WeakSet()
+
+
+def get_rules_manager() -> RulesFactsManager:
+    """Общий менеджер правил, создаётся при первом обращении."""
+    global _rules_manager
+    if _rules_manager is None:
+        _rules_manager = RulesFactsManager()
+    return _rules_manager
+
+
+def set_rules_manager(manager: Optional[RulesFactsManager]) -> None:
+    """Задать общий менеджер правил явно (например, для другого файла базы знаний); None сбрасывает его."""
+    global _rules_manager
+    _rules_manager = manager
 
 
 # Универсальная функция для добавления кнопки "назад"
@@ -30,6 +53,9 @@ def add_back_button(on_click):
 
 # Функция для добавления пользовательских стилей
 def add_styles():
+    if context.client in _styled_clients:
+        return
+    _styled_clients.add(context.client)
     ui.add_css(CSS_STYLES)
 
 
@@ -55,6 +81,7 @@ def create_header(text):
 # Страница редактирования фактов
 def facts_page():  # todo: лучше перетащить в отдельный файл и при вызове передовать состояние
     """Создает страницу для редактирования фактов."""
+    rules_manager = get_rules_manager()
 
     def delete_fact(fact_name):
         """Удаляет факт и уведомляет об ошибке, если он используется в правилах."""
@@ -62,7 +89,7 @@ def facts_page():  # todo: лучше перетащить в отдельный
             rules_manager.delete_fact(fact_name)
             rules_manager.save()
             ui.notify(f"Факт '{fact_name}' успешно удалён.")
-            ui.navigate.reload()
+            router.reload()
         except ValueError as e:
             # Показываем ошибку в нотификации
             ui.notify(str(e), color="red")
@@ -85,19 +112,19 @@ def facts_page():  # todo: лучше перетащить в отдельный
         rules_manager.add_fact(fact_name, question)
         rules_manager.save()
         ui.notify(f"Факт '{fact_name}' добавлен.")
-        ui.navigate.reload()
+        router.reload()
 
     facts = rules_manager.get_facts()
     rows = []
 
     # Добавляем кнопку для возвращения назад
-    add_back_button(lambda: ui.navigate.to("/rules"))  # не туда
+    add_back_button(lambda: router.navigate_to("/rules"))  # не туда
 
     # Создаем заголовок страницы
     create_header("Факты")
 
     # Генерируем строки для отображения фактов
-    for fact_name, question in facts.items():
+    for fact_name, fact in facts.items():
         if fact_name == rules_manager.action_key:
             continue
         rows.append([
@@ -105,7 +132,7 @@ def facts_page():  # todo: лучше перетащить в отдельный
             ui.label(fact_name).classes("align-middle col-3 my-auto"),
 
             # Поле ввода для редактирования вопроса
-            ui.input(value=question, on_change=lambda e, name=fact_name: update_fact_question(name, e.value))
+            ui.input(value=fact.question, on_change=lambda e, name=fact_name: update_fact_question(name, e.value))
             .classes("col-7 align-middle my-auto"),
 
             # Кнопка для удаления факта
@@ -129,34 +156,38 @@ def facts_page():  # todo: лучше перетащить в отдельный
 
 
 def add_rule():
+    rules_manager = get_rules_manager()
     rules_manager.add_blank_rule()
     rules_manager.save()
-    ui.navigate.reload()
+    router.reload()
 
 
 def delete_rule(ind):
+    rules_manager = get_rules_manager()
     rules_manager.delete_rule(ind)
     rules_manager.save()
-    ui.navigate.reload()
+    router.reload()
 
 
 def move_rule_up(ind):
+    rules_manager = get_rules_manager()
     rules_manager.move_rule_up(ind)
     rules_manager.save()
-    ui.navigate.reload()
+    router.reload()
 
 
 def move_rule_down(ind):
+    rules_manager = get_rules_manager()
     rules_manager.move_rule_down(ind)
     rules_manager.save()
-    ui.navigate.reload()
+    router.reload()
 
 
 # Страница отображения списка правил
 def rules_page():
     """Страница отображения списка правил."""
-    rules = rules_manager.get_rules()
-    add_back_button(lambda: ui.navigate.to("/"))
+    rules = get_rules_manager().get_rules()
+    add_back_button(lambda: router.navigate_to("/"))
 
     create_header("Список правил")
 
@@ -170,7 +201,7 @@ def rules_page():
 
         # Создаём контейнер для кнопок редактирования и удаления
         with ui.row().classes("col-2 justify-center my-auto").style("gap: 0.25rem;") as action_buttons:
-            ui.button(icon="edit", color="standard", on_click=lambda r=i: ui.navigate.to(f"rule/{r}")).props(
+            ui.button(icon="edit", color="standard", on_click=lambda r=i: router.navigate_to(f"/rule/{r}")).props(
                 BUTTON_STYLE)
             ui.button(icon="delete", color="standard", on_click=lambda r=i: delete_rule(r)).props(BUTTON_STYLE)
 
@@ -194,5 +225,5 @@ def rules_page():
 # Главная страница
 def main_page():
     with ui.column().classes("w-full p-12 my-auto justify-center items-center gap-4"):
-        ui.button('Изменить правила', on_click=lambda: ui.navigate.to("/rules")).classes("w-1/3")
-        ui.button('Консультация', on_click=lambda: ui.navigate.to("/cons")).classes("w-1/3")
+        ui.button('Изменить правила', on_click=lambda: router.navigate_to("/rules")).classes("w-1/3")
+        ui.button('Консультация', on_click=lambda: router.navigate_to("/cons")).classes("w-1/3")
@@ -1,45 +1,170 @@
-from typing import Callable, Dict, Union
+import json
+import re
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-from nicegui import background_tasks, helpers, ui
+from nicegui import background_tasks, context, helpers, ui
+
+PARAM_RE = re.compile(r"\{(\w+)\}")
+
+# Роутеры подключённых клиентов: страницы переходят через роутер своего клиента
+_routers: Dict[str, "Router"] = {}
 
 
 class RouterFrame(ui.element):
     pass
 
 
+def _compile(path: str) -> re.Pattern:
+    """Регулярное выражение для пути с параметрами вида /rule/{rule_index}."""
+    pattern, pos = "", 0
+    for match in PARAM_RE.finditer(path):
+        pattern += re.escape(path[pos:match.start()]) + f"(?P<{match.group(1)}>[^/]+)"
+        pos = match.end()
+    return re.compile(pattern + re.escape(path[pos:]) + "$")
+
+
 class Router:
 
-    def __init__(self) -> None:
+    def __init__(self, revision: Optional[Callable[[], object]] = None) -> None:
+        """
+        Роутер одностраничного режима: страницы строятся во фреймах внутри одного соединения.
+
+        :param revision: Функция, возвращающая ревизию данных. Кешируемые фреймы
+            показываются повторно без перестроения, пока ревизия не изменится.
+        """
         self.routes: Dict[str, Callable] = {}
         self.content: ui.element = None
+        self.revision = revision
+        self.path: Optional[str] = None
+        # Обратная карта и шаблоны путей строятся в add, а не при каждом переходе
+        self._paths: Dict[Callable, str] = {}
+        self._patterns: List[Tuple[re.Pattern, Callable]] = []
+        self._cached: Dict[Callable, bool] = {}
+        # Построенные фреймы кешируемых страниц: путь -> (ревизия, фрейм)
+        self._frames: Dict[str, Tuple[object, ui.element]] = {}
+        self._current: Optional[ui.element] = None
+
+    def add(self, path: str, cache: bool = False):
+        """
+        Зарегистрировать построитель страницы.
 
-    def add(self, path: str):
+        :param path: Путь; параметры в фигурных скобках передаются построителю по имени.
+        :param cache: Сохранять построенный фрейм до изменения ревизии.
+        """
         def decorator(func: Callable):
             self.routes[path] = func
+            self._paths[func] = path
+            self._cached[func] = cache
+            if PARAM_RE.search(path):
+                self._patterns.append((_compile(path), func))
             return func
         return decorator
 
-    def open(self, target: Union[Callable, str]) -> None:
+    def resolve(self, path: str) -> Tuple[Callable, Dict[str, str]]:
+        """Найти построитель и параметры для пути."""
+        builder = self.routes.get(path)
+        if builder is not None:
+            return builder, {}
+        for pattern, builder in self._patterns:
+            match = pattern.match(path)
+            if match:
+                return builder, match.groupdict()
+        raise KeyError(f"Нет страницы для пути {path}")
+
+    def open(self, target: Union[Callable, str], rebuild: bool = False) -> None:
         if isinstance(target, str):
             path = target
-            builder = self.routes[target]
+            builder, params = self.resolve(path)
         else:
-            path = {v: k for k, v in self.routes.items()}[target]
-            builder = target
+            path = self._paths[target]
+            builder, params = target, {}
+
+        revision = self.revision() if self.revision is not None else None
+        self._evict(revision, path if rebuild else None)
+        self._hide_current()
+        self.path = path
+        self.content.client.run_javascript(f'''
+            if (window.location.pathname !== {json.dumps(path)}) {{
+                history.pushState({{page: {json.dumps(path)}}}, "", {json.dumps(path)});
+            }}
+        ''')
+
+        cached = self._frames.get(path)
+        if cached is not None:
+            self._current = cached[1]
+            self._current.visible = True
+            return
+
+        with self.content:
+            # Колонка повторяет раскладку содержимого страницы, как без роутера
+            frame = ui.column().classes("w-full")
+        self._current = frame
+        if self._cached[builder]:
+            self._frames[path] = (revision, frame)
 
         async def build() -> None:
-            with self.content:
-                ui.run_javascript(f'''
-                    if (window.location.pathname !== "{path}") {{
-                        history.pushState({{page: "{path}"}}, "", "{path}");
-                    }}
-                ''')
-                result = builder()
-                if helpers.is_coroutine_function(builder):
-                    await result
-        self.content.clear()
-        background_tasks.create(build())
+            with frame:
+                await builder(**params)
+
+        if helpers.is_coroutine_function(builder):
+            background_tasks.create(build())
+        else:
+            with frame:
+                builder(**params)
+
+    def reload(self) -> None:
+        """Перестроить текущую страницу."""
+        self.open(self.path, rebuild=True)
+
+    def _hide_current(self) -> None:
+        """Скрыть кешируемый фрейм текущей страницы или удалить некешируемый."""
+        if self._current is None:
+            return
+        if any(frame is self._current for _, frame in self._frames.values()):
+            self._current.visible = False
+        else:
+            self._current.delete()
+        self._current = None
+
+    def _evict(self, revision: object, rebuild: Optional[str] = None) -> None:
+        """Забыть фреймы, построенные для другой ревизии, и фрейм страницы rebuild."""
+        for path, (frame_revision, frame) in list(self._frames.items()):
+            if frame_revision != revision or path == rebuild:
+                del self._frames[path]
+                # Текущий фрейм удалит _hide_current
+                if frame is not self._current:
+                    frame.delete()
 
     def frame(self) -> ui.element:
-        self.content = RouterFrame().on('open', lambda e: self.open(e.args))
+        self.content = RouterFrame()
+        # Кнопки «назад»/«вперёд» браузера открывают страницу из истории без перезагрузки
+        ui.on("router_open", lambda e: self.open(e.args))
+        ui.add_head_html('<script>window.addEventListener("popstate", '
+                         '() => emitEvent("router_open", window.location.pathname));</script>')
+        client = context.client
+        _routers[client.id] = self
+        client.on_delete(lambda: _routers.pop(client.id, None))
         return self.content
+
+
+def current_router() -> Optional[Router]:
+    """Роутер текущего клиента или None, если страница открыта не в одностраничном режиме."""
+    return _routers.get(context.client.id)
+
+
+def navigate_to(path: str) -> None:
+    """Перейти на страницу: через роутер клиента или обычной загрузкой страницы."""
+    router = current_router()
+    if router is None:
+        ui.navigate.to(path)
+    else:
+        router.open(path)
+
+
+def reload() -> None:
+    """Перестроить текущую страницу."""
+    router = current_router()
+    if router is None:
+        ui.navigate.reload()
+    else:
+        router.reload()
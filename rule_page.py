@@ -1,19 +1,20 @@
 from nicegui import ui
 
+import router
 from pages import add_back_button, create_header, LABEL_STYLE, BUTTON_STYLE, create_list, INPUT_WIDTH, add_styles, \
-    rules_manager as RULES_MANAGER
+    get_rules_manager
 
 
 class RulePage:
     def __init__(self, rule_index):
-        self.rules_manager = RULES_MANAGER.copy()
+        self.rules_manager = get_rules_manager().copy()
         self.rule_index = rule_index
         self._load()
 
     def _load(self):
         self.rule = self.rules_manager.get_rule(self.rule_index)
         self.facts = self.rules_manager.get_facts()
-        self.temp_conditions = list(self.rule["if"].items())
+        self.temp_conditions = list(self.rule.conditions)
 
     def act_or_fact(self, selected_value, action_val_input, fact_val_selector):
         """Функция, вызываемая при изменении выбора факта или действия."""
@@ -38,7 +39,7 @@ class RulePage:
         """Перезагрузка данных."""
         self.rules_manager.reload_data()
         self._load()
-        ui.navigate.reload()
+        router.reload()
 
     def delete_dialog(self):
         with ui.dialog() as dialog, ui.card():
@@ -58,7 +59,7 @@ class RulePage:
         """Сохранение изменений."""
 
         self.rules_manager.save()
-        RULES_MANAGER.reload_data()
+        get_rules_manager().reload_data()
 
     def change_condition_fact(self, cond_id, fact):
         self.temp_conditions[cond_id] = (
@@ -78,7 +79,8 @@ class RulePage:
         self.rules_manager.set_then(self.rule_index, val, None)
 
     def change_then_val(self, val):
-        self.rules_manager.set_then(self.rule_index, list(self.rule["then"].keys())[0], val) #todo: а если несколько и вообще уродливо
+        then_fact = self.rules_manager.get_rule(self.rule_index).actions[0][0]
+        self.rules_manager.set_then(self.rule_index, then_fact, val) #todo: а если несколько и вообще уродливо
 
     def navigate_to_facts(self):
         """Переход на страницу фактов."""
@@ -87,7 +89,7 @@ class RulePage:
     def delete_rule(self):
         self.rules_manager.delete_rule(self.rule_index)
         self._save()
-        ui.navigate.to("/rules")
+        router.navigate_to("/rules")
 
     @ui.refreshable
     def rows_list(self):
@@ -125,7 +127,7 @@ class RulePage:
         self.rows_list()
 
         # Выбираем первое условие в "then"
-        then = list(self.rule["then"].items())[0]
+        then = self.rule.actions[0]
 
         with ui.row().classes("w-full p-2 justify-center"):
             ui.button(
@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from engine.consultant import Consultant
+
+logging.disable(logging.CRITICAL)
+
+
+class LateRevivalTest(unittest.TestCase):
+    """Факт, выведенный в конце прохода, оживляет уже пройденное правило."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp.name, "base.json")
+        data = {
+            "facts": {"B": "B?", "Q1": "Q1?", "Q2": "Q2?", "действие": None},
+            "rules": {
+                "1": {"if": {"B": 1}, "then": {"действие": "A1"}},
+                "2": {"if": {"Q1": 1}, "then": {"B": 1}},
+                "3": {"if": {"Q2": 1}, "then": {"C": 1}},
+            },
+        }
+        with open(self.file_name, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_revived_rule_fires_before_finish(self):
+        consultant = Consultant(self.file_name)
+        answers = {"B": None, "Q1": 1, "Q2": 0}
+        asked = []
+        while True:
+            fact = consultant.process_rules()
+            if not fact:
+                break
+            asked.append(fact)
+            consultant.answer_question(fact, answers[fact])
+
+        self.assertEqual(asked, ["B", "Q1"])
+        self.assertEqual(consultant.suggested_actions, ["A1"])
+
+        # Повторный вызов после завершения ничего не добавляет
+        consultant.process_rules()
+        self.assertEqual(consultant.suggested_actions, ["A1"])
+
+
+class DuplicateRuleTest(unittest.TestCase):
+    """Правила, отличающиеся только порядком условий, срабатывают один раз."""
+
+    def test_reordered_duplicate_fires_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file_name = os.path.join(tmp, "base.json")
+            data = {
+                "facts": {"a": "a?", "b": "b?", "действие": None},
+                "rules": {
+                    "1": {"if": {"a": 1, "b": 0}, "then": {"действие": "X"}},
+                    "2": {"if": {"b": 0, "a": 1}, "then": {"действие": "X"}},
+                },
+            }
+            with open(file_name, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+
+            consultant = Consultant(file_name)
+            answers = {"a": 1, "b": 0}
+            while True:
+                fact = consultant.process_rules()
+                if not fact:
+                    break
+                consultant.answer_question(fact, answers[fact])
+
+        self.assertEqual(consultant.suggested_actions, ["X"])
+        self.assertEqual(consultant.process_actions, ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from engine import journal as journal_module
+from engine.journal import DEL_RULE, SET_FACT, SET_RULE, KnowledgeBaseJournal
+
+
+def set_fact(name, question="?"):
+    return {"op": SET_FACT, "id": name, "value": question}
+
+
+def _append_facts(file_name, tag, count):
+    """Процесс-писатель для проверки блокировки между процессами."""
+    journal = KnowledgeBaseJournal(file_name, compact_interval=None)
+    for i in range(count):
+        journal.append([set_fact(f"{tag}-{i}")])
+    journal.close()
+
+
+def _compact_until(file_name, stop):
+    """Процесс, сворачивающий журнал, пока идёт запись."""
+    journal = KnowledgeBaseJournal(file_name, compact_interval=None)
+    while not stop.is_set():
+        journal.compact()
+    journal.compact()
+    journal.close()
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp.name, "base.json")
+        self.write_snapshot({"facts": {"a": "A?"}, "rules": {"1": {"if": {"a": 1}, "then": {"действие": "X"}}}})
+        self.journals = []
+
+    def tearDown(self):
+        for journal in self.journals:
+            journal.close()
+        self.tmp.cleanup()
+
+    def write_snapshot(self, data):
+        with open(self.file_name, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+
+    def read_snapshot(self):
+        with open(self.file_name, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def open_journal(self, **kwargs):
+        """Новый экземпляр журнала, как при запуске другого процесса."""
+        kwargs.setdefault("compact_interval", None)
+        journal = KnowledgeBaseJournal(self.file_name, **kwargs)
+        self.journals.append(journal)
+        return journal
+
+    def test_load_replays_journal_over_snapshot(self):
+        journal = self.open_journal()
+        journal.append([set_fact("b", "B?"), {"op": SET_RULE, "id": "2", "value": {"if": {"b": 0}, "then": {"a": 1}}}])
+        journal.append([{"op": DEL_RULE, "id": "1"}, set_fact("a", "Новый A?")])
+
+        data = self.open_journal().load()
+        self.assertEqual(data["facts"], {"a": "Новый A?", "b": "B?"})
+        self.assertEqual(data["rules"], {"2": {"if": {"b": 0}, "then": {"a": 1}}})
+
+    def test_torn_last_line_is_dropped(self):
+        self.open_journal().append([set_fact("b")])
+        with open(self.file_name + ".journal", 'a', encoding='utf-8') as file:
+            file.write('{"op": "set_fact", "id": "c"')
+
+        journal = self.open_journal()
+        self.assertNotIn("c", journal.load()["facts"])
+        journal.append([set_fact("d")])
+
+        facts = self.open_journal().load()["facts"]
+        self.assertIn("b", facts)
+        self.assertIn("d", facts)
+        self.assertNotIn("c", facts)
+
+    def test_torn_tail_from_other_process_after_first_check(self):
+        journal = self.open_journal()
+        journal.append([set_fact("b")])
+        # Другой процесс упал посреди записи уже после проверки хвоста этим процессом
+        with open(self.file_name + ".journal", 'a', encoding='utf-8') as file:
+            file.write('{"op": "set_fa')
+        journal.append([set_fact("c")])
+
+        facts = self.open_journal().load()["facts"]
+        self.assertIn("b", facts)
+        self.assertIn("c", facts)
+
+    def test_corrupt_snapshot_raises(self):
+        with open(self.file_name, 'w', encoding='utf-8') as file:
+            file.write('{"facts": {"a": ')
+        with self.assertRaises(ValueError):
+            self.open_journal().load()
+
+    def test_compact_moves_ops_into_snapshot(self):
+        journal = self.open_journal()
+        journal.append([set_fact("b", "B?"), {"op": DEL_RULE, "id": "1"}])
+        expected = self.open_journal().load()
+
+        journal.compact()
+        self.assertEqual(self.read_snapshot(), expected)
+        self.assertEqual(os.path.getsize(self.file_name + ".journal"), 0)
+        self.assertEqual(self.open_journal().load(), expected)
+
+    def test_compact_skipped_when_journal_replaced(self):
+        journal = self.open_journal()
+        journal.append([set_fact("b")])
+        snapshot = self.read_snapshot()
+        replaced = json.dumps(set_fact("c")) + "\n"
+        load_snapshot = journal._load_snapshot
+
+        def compacted_elsewhere():
+            # Пока снимок строится вне блокировки, другой процесс заменяет журнал
+            tmp_name = self.file_name + ".journal.other"
+            with open(tmp_name, 'w', encoding='utf-8') as file:
+                file.write(replaced)
+            os.replace(tmp_name, self.file_name + ".journal")
+            return load_snapshot()
+
+        with mock.patch.object(journal, "_load_snapshot", side_effect=compacted_elsewhere):
+            journal.compact()
+
+        self.assertEqual(self.read_snapshot(), snapshot)
+        with open(self.file_name + ".journal", 'r', encoding='utf-8') as file:
+            self.assertEqual(file.read(), replaced)
+
+    def test_appends_share_one_fsync(self):
+        journal = self.open_journal(sync_delay=0.05)
+        fsync = os.fsync
+        calls = []
+        with mock.patch.object(journal_module.os, "fsync", side_effect=lambda fd: (calls.append(fd), fsync(fd))):
+            for i in range(20):
+                journal.append([set_fact(f"f{i}")])
+            self.assertEqual(calls, [])
+            # Фоновый поток сбрасывает все записи окна одним вызовом
+            deadline = time.monotonic() + 5
+            while not calls and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+        self.assertEqual(len(calls), 1)
+
+    def test_append_after_close_syncs_immediately(self):
+        journal = self.open_journal()
+        journal.close()
+        with mock.patch.object(journal_module.os, "fsync") as fsync:
+            journal.append([set_fact("b")])
+        fsync.assert_called_once()
+        self.assertIn("b", self.open_journal().load()["facts"])
+
+    @unittest.skipIf(journal_module.fcntl is None, "блокировка между процессами требует fcntl")
+    def test_concurrent_processes_lose_no_ops(self):
+        stop = multiprocessing.Event()
+        compactor = multiprocessing.Process(target=_compact_until, args=(self.file_name, stop))
+        writers = [multiprocessing.Process(target=_append_facts, args=(self.file_name, tag, 200)) for tag in "abcd"]
+        compactor.start()
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+        stop.set()
+        compactor.join()
+
+        facts = self.open_journal().load()["facts"]
+        self.assertEqual(sum(1 for name in facts if "-" in name), 800)
+
+
+if __name__ == "__main__":
+    unittest.main()
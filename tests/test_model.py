@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from engine.journal import DEFAULT_FILE_NAME
+from engine.manager import RulesFactsManager
+from engine.model import Rule, facts_from_json, facts_to_json
+
+
+class ModelRoundTripTest(unittest.TestCase):
+    """Преобразование базы знаний из JSON и обратно без потерь."""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(DEFAULT_FILE_NAME, 'r', encoding='utf-8') as file:
+            cls.data = json.load(file)
+
+    def test_rules_round_trip(self):
+        for rule_id, rule in self.data["rules"].items():
+            with self.subTest(rule_id=rule_id):
+                restored = Rule.from_dict(rule).to_dict()
+                self.assertEqual(restored, rule)
+                # Порядок условий сохраняется для записи и отображения
+                self.assertEqual(list(restored["if"]), list(rule["if"]))
+
+    def test_facts_round_trip(self):
+        self.assertEqual(facts_to_json(facts_from_json(self.data["facts"])), self.data["facts"])
+
+
+class RuleEqualityTest(unittest.TestCase):
+
+    def test_condition_order_does_not_matter(self):
+        rule = Rule({"a": 1, "b": 0}, {"действие": "X"})
+        reordered = Rule({"b": 0, "a": 1}, {"действие": "X"})
+        self.assertEqual(rule, reordered)
+        self.assertEqual(hash(rule), hash(reordered))
+        self.assertEqual(len({rule, reordered}), 1)
+
+    def test_different_values_are_not_equal(self):
+        self.assertNotEqual(Rule({"a": 1, "b": 0}, {"действие": "X"}), Rule({"a": 1, "b": 1}, {"действие": "X"}))
+        self.assertNotEqual(Rule({"a": 1}, {"действие": "X"}), Rule({"a": 1}, {"действие": "Y"}))
+
+
+class ManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.tmp.name, "base.json")
+        shutil.copyfile(DEFAULT_FILE_NAME, self.file_name)
+        self.manager = RulesFactsManager(self.file_name)
+
+    def tearDown(self):
+        self.manager._journal.close()
+        self.tmp.cleanup()
+
+    def test_copy_is_independent(self):
+        fact = next(name for name in self.manager.get_facts() if name != self.manager.action_key)
+        question = self.manager.get_facts()[fact].question
+        rule_id = next(iter(self.manager.get_rules()))
+        rule = self.manager.get_rule(rule_id)
+
+        copy = self.manager.copy()
+        copy.update_fact_question(fact, "Изменённый вопрос?")
+        copy.add_condition(rule_id, "новый факт", 1)
+
+        self.assertEqual(self.manager.get_facts()[fact].question, question)
+        self.assertEqual(self.manager.get_rule(rule_id), rule)
+        self.assertNotIn("новый факт", dict(self.manager.get_rule(rule_id).conditions))
+        self.assertNotIn("новый факт", self.manager.get_facts())
+
+    def test_deleting_missing_key_changes_nothing(self):
+        revision = self.manager.revision
+        self.assertFalse(self.manager.delete_fact("нет такого факта"))
+        self.assertFalse(self.manager.delete_rule("нет такого правила"))
+        self.assertEqual(self.manager.revision, revision)
+        self.assertEqual(self.manager._pending_ops(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()